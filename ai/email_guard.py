@@ -1,9 +1,18 @@
 # ai/email_guard.py
 import os
 import sys
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple, Union
 import re
+import string
+import bisect
+import hashlib
+import operator
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime
+from enum import IntEnum
 
 # Try to import phishing_detection_py
 try:
@@ -13,6 +22,234 @@ except ImportError:
     PHISHING_DETECTOR_AVAILABLE = False
     print("Warning: phishing_detection_py not available.")
 
+# Try to import hyperscan for single-pass multi-pattern scanning
+try:
+    import hyperscan
+    HYPERSCAN_AVAILABLE = True
+except ImportError:
+    HYPERSCAN_AVAILABLE = False
+
+# Try to import pyahocorasick for single-pass keyword counting
+try:
+    import ahocorasick
+    AHOCORASICK_AVAILABLE = True
+except ImportError:
+    AHOCORASICK_AVAILABLE = False
+
+# Try to import numpy for batched rule scoring
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+# Precompiled patterns, shared by every analyze() call.
+# Each category is a single alternation so it costs one search per email.
+# Patterns are lowercase and matched against already-lowercased text.
+URGENCY_RE = re.compile(
+    r'urgent.*action'
+    r'|limited.*time'
+    r'|expires.*soon'
+    r'|act.*now'
+    r'|immediate.*attention'
+)
+
+FINANCIAL_RE = re.compile(
+    r'bank.*account'
+    r'|credit.*card'
+    r'|payment.*required'
+    r'|money.*transfer'
+    r'|account.*verification'
+)
+
+PERSONAL_RE = re.compile(
+    r'social.*security'
+    r'|password.*reset'
+    r'|personal.*information'
+    r'|verify.*identity'
+    r'|account.*details'
+)
+
+DOMAIN_RE = re.compile(
+    r'paypal.*verify'
+    r'|bank.*secure'
+    r'|account.*update'
+    r'|security.*alert'
+)
+
+# URL body: '!', the '$'-'_' range (digits, upper case, '/', ':', '?', '=',
+# '%' and other punctuation) and lower case letters, as one character class
+URL_RE = re.compile(r'https?://[!$-_a-z]+')
+EMAIL_RE = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+
+# Category order doubles as the hyperscan pattern id
+SUSPICIOUS_PATTERN_CATEGORIES = (
+    ('urgency', URGENCY_RE),
+    ('financial_request', FINANCIAL_RE),
+    ('personal_info_request', PERSONAL_RE),
+    ('suspicious_domain', DOMAIN_RE),
+)
+
+def _build_hyperscan_db():
+    """Compile all category patterns into one hyperscan database"""
+    db = hyperscan.Database()
+    db.compile(
+        expressions=[regex.pattern.encode() for _, regex in SUSPICIOUS_PATTERN_CATEGORIES],
+        ids=list(range(len(SUSPICIOUS_PATTERN_CATEGORIES))),
+        elements=len(SUSPICIOUS_PATTERN_CATEGORIES),
+        flags=[hyperscan.HS_FLAG_SINGLEMATCH] * len(SUSPICIOUS_PATTERN_CATEGORIES)
+    )
+    return db
+
+_HS_DB = None
+if HYPERSCAN_AVAILABLE:
+    try:
+        _HS_DB = _build_hyperscan_db()
+    except Exception as e:
+        print(f"Warning: failed to compile hyperscan database, using re: {e}")
+
+# Hyperscan scratch space must not be shared between concurrent scans
+_hs_local = threading.local()
+
+def _hs_match(pattern_id, start, end, flags, context):
+    """Record the matched category in the bitmask held by context"""
+    context[0] |= 1 << pattern_id
+
+def _hs_scan(text: str) -> int:
+    """Scan text once and return a bitmask of matched categories"""
+    scratch = getattr(_hs_local, 'scratch', None)
+    if scratch is None:
+        scratch = _hs_local.scratch = hyperscan.Scratch(_HS_DB)
+    mask = [0]
+    _HS_DB.scan(text.encode('utf-8', 'ignore'), match_event_handler=_hs_match, context=mask, scratch=scratch)
+    return mask[0]
+
+# Keyword lists. Single words are matched against the email's tokens;
+# multi-word phrases are matched as substrings of the lowercased text.
+SUSPICIOUS_WORDS = frozenset({'urgent', 'account suspended', 'verify identity', 'click here', 'bank', 'password'})
+URGENCY_WORDS = frozenset({'urgent', 'immediate', 'asap', 'quickly', 'hurry', 'limited time', 'expires', 'deadline'})
+MONEY_WORDS = frozenset({'money', 'bank', 'account', 'credit card', 'payment', 'transfer', 'refund', 'lottery', 'inheritance'})
+
+KEYWORD_CATEGORIES = {
+    'suspicious': SUSPICIOUS_WORDS,
+    'urgency': URGENCY_WORDS,
+    'money': MONEY_WORDS,
+}
+
+# Keyword -> categories it counts towards (some keywords are shared)
+_KEYWORD_INDEX: Dict[str, tuple] = {}
+for _category, _words in KEYWORD_CATEGORIES.items():
+    for _word in _words:
+        _KEYWORD_INDEX[_word] = _KEYWORD_INDEX.get(_word, ()) + (_category,)
+
+_KEYWORD_TOKENS = frozenset(word for word in _KEYWORD_INDEX if ' ' not in word)
+_KEYWORD_PHRASES = tuple(word for word in _KEYWORD_INDEX if ' ' in word)
+
+_PHRASE_AUTOMATON = None
+if AHOCORASICK_AVAILABLE:
+    _PHRASE_AUTOMATON = ahocorasick.Automaton()
+    for _phrase in _KEYWORD_PHRASES:
+        _PHRASE_AUTOMATON.add_word(_phrase, _phrase)
+    _PHRASE_AUTOMATON.make_automaton()
+
+# Stripped from token edges so "asap." or "(urgent)" still match
+_TOKEN_PUNCTUATION = string.punctuation + '\u201c\u201d\u2018\u2019'
+
+def _count_keywords(text_lower: str, words: Optional[List[str]] = None) -> Dict[str, int]:
+    """Count distinct keywords per category found in lowercased text"""
+    if words is None:
+        words = text_lower.split()
+    
+    # Whole-token matches: one hashed intersection for all categories
+    found = list(_KEYWORD_TOKENS & {word.strip(_TOKEN_PUNCTUATION) for word in words})
+    
+    if _PHRASE_AUTOMATON is not None:
+        found.extend({phrase for _, phrase in _PHRASE_AUTOMATON.iter(text_lower)})
+    else:
+        found.extend(phrase for phrase in _KEYWORD_PHRASES if phrase in text_lower)
+    
+    counts = dict.fromkeys(KEYWORD_CATEGORIES, 0)
+    for word in found:
+        for category in _KEYWORD_INDEX[word]:
+            counts[category] += 1
+    return counts
+
+# Decision codes used internally; strings are produced only for output
+DECISION_STR = ('safe', 'spam', 'phishing', 'error', 'unknown')
+
+class Decision(IntEnum):
+    """Analyzer decision; rule scoring relies on SAFE < SPAM < PHISHING"""
+    SAFE = 0
+    SPAM = 1
+    PHISHING = 2
+    ERROR = 3
+    UNKNOWN = 4
+    
+    def __str__(self) -> str:
+        return DECISION_STR[self]
+
+# Rule-based scoring. Feature vector: one 0/1 flag per suspicious pattern
+# category, then the urgency and money keyword counts.
+RULE_WEIGHTS = (30, 40, 50, 60, 10, 15)
+RISK_FACTOR_LABELS = (
+    'Urgency indicators detected',
+    'Financial request detected',
+    'Personal information request detected',
+    'Suspicious domain detected',
+    '{} urgency indicators',
+    '{} financial indicators',
+)
+
+# Risk score thresholds: below 40 is safe, 40-69 spam, 70 and above phishing.
+# The decision code is the number of thresholds the score reaches.
+RISK_THRESHOLDS = (40, 70)
+CONFIDENCE_FUNCTIONS = (
+    lambda risk_score: max(1.0 - (risk_score / 40.0), 0.6),
+    lambda risk_score: min(risk_score / 70.0, 0.85),
+    lambda risk_score: min(risk_score / 100.0, 0.95),
+)
+
+def _score_features(features: Tuple[int, ...]) -> Tuple[int, Decision, float]:
+    """Score a rule feature vector, returning (risk_score, decision, confidence)"""
+    risk_score = sum(map(operator.mul, RULE_WEIGHTS, features))
+    decision = Decision(bisect.bisect_right(RISK_THRESHOLDS, risk_score))
+    return risk_score, decision, CONFIDENCE_FUNCTIONS[decision](risk_score)
+
+def _score_feature_rows(rows: List[Tuple[int, ...]]) -> Tuple[List[int], List[Decision], List[float]]:
+    """Score many feature vectors at once, returning parallel score/decision/confidence lists"""
+    if not rows:
+        return [], [], []
+    
+    if not NUMPY_AVAILABLE:
+        risk_scores, decisions, confidences = zip(*map(_score_features, rows))
+        return list(risk_scores), list(decisions), list(confidences)
+    
+    features = np.asarray(rows, dtype=np.int32)
+    risk_scores = features @ np.asarray(RULE_WEIGHTS, dtype=np.int32)
+    
+    # Branchless threshold lookup, then pick each row's confidence by decision id
+    decision_ids = np.searchsorted(np.asarray(RISK_THRESHOLDS, dtype=np.int32), risk_scores, side='right')
+    confidences = np.choose(decision_ids, (
+        np.maximum(1.0 - risk_scores / 40.0, 0.6),
+        np.minimum(risk_scores / 70.0, 0.85),
+        np.minimum(risk_scores / 100.0, 0.95),
+    ))
+    return risk_scores.tolist(), list(map(Decision, decision_ids.tolist())), confidences.tolist()
+
+# Description templates shared by the analyzers
+RULE_FACTORS_TEMPLATE = 'Risk score: {}/100. Detected factors: {}. This analysis is based on pattern matching and content analysis.'
+RULE_SAFE_TEMPLATE = 'Risk score: {}/100. No suspicious patterns detected. Email appears to be safe based on rule-based analysis.'
+TEXT_PHISHING_TEMPLATE = 'High risk phishing indicators detected: {} suspicious patterns found in email content. Multiple red flags suggest this is likely a phishing attempt.'
+TEXT_SPAM_TEMPLATE = 'Spam indicators detected: {} suspicious patterns found. This email shows characteristics of spam or low-quality content.'
+TEXT_SAFE_TEMPLATE = 'No suspicious patterns detected: Email content appears safe with {} suspicious indicators found.'
+
+def _describe_rule_result(risk_score: int, features: Tuple[int, ...]) -> str:
+    """Format the rule-based description for a scored feature vector"""
+    risk_factors = [label.format(value) for label, value in zip(RISK_FACTOR_LABELS, features) if value]
+    if risk_factors:
+        return RULE_FACTORS_TEMPLATE.format(risk_score, ', '.join(risk_factors))
+    return RULE_SAFE_TEMPLATE.format(risk_score)
+
 class ModelAnalyzer:
     """Base class for all model analyzers"""
     
@@ -23,6 +260,20 @@ class ModelAnalyzer:
     def analyze(self, email_text: str) -> Dict[str, Any]:
         """Analyze email text and return results"""
         raise NotImplementedError("Subclasses must implement analyze method")
+    
+    def analyze_batch(self, email_texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze several emails; subclasses may override with a faster batch path"""
+        return [self.analyze(email_text) for email_text in email_texts]
+    
+    def _error_result(self, error_msg: str) -> Dict[str, Any]:
+        """Return error result"""
+        return {
+            'model_source': self.model_source,
+            'model_name': self.model_name,
+            'decision': Decision.ERROR,
+            'confidence': 0.0,
+            'description': error_msg
+        }
 
 class PhishingDetectorAnalyzer(ModelAnalyzer):
     """Primary analyzer using phishing-detection-py package"""
@@ -50,14 +301,14 @@ class PhishingDetectorAnalyzer(ModelAnalyzer):
     def analyze(self, email_text: str) -> Dict[str, Any]:
         """Analyze email using phishing-detection-py"""
         try:
-            # Extract URLs from email text for analysis
-            urls = self._extract_urls(email_text)
+            # Only the first URL is analyzed, so stop scanning once it is found
+            url = self._extract_first_url(email_text) if self.detector else None
             
-            # If we have a working detector and URLs, try URL analysis
-            if self.detector and urls:
+            # If we have a working detector and a URL, try URL analysis
+            if url:
                 try:
                     # Analyze the first URL using the detector
-                    url_result = self.detector.predict(urls[0])
+                    url_result = self.detector.predict(url)
                     
                     # Process the result - phishing-detection-py returns a dict with prediction and description
                     if url_result is not None:
@@ -69,16 +320,16 @@ class PhishingDetectorAnalyzer(ModelAnalyzer):
                         else:
                             # Fallback if result is just a prediction value
                             prediction = url_result
-                            description = f'URL analysis result for {urls[0]}'
+                            description = f'URL analysis result for {url}'
                             confidence = 0.85
                         
                         # Map prediction to standard format
                         if prediction == 1:
-                            decision = 'phishing'
+                            decision = Decision.PHISHING
                         elif prediction == 0:
-                            decision = 'safe'
+                            decision = Decision.SAFE
                         else:
-                            decision = 'unknown'
+                            decision = Decision.UNKNOWN
                         
                         return {
                             'model_source': self.model_source,
@@ -88,8 +339,12 @@ class PhishingDetectorAnalyzer(ModelAnalyzer):
                             'description': description
                         }
                 except Exception as e:
-                    # If URL analysis fails, fall back to text analysis
+                    # If URL analysis fails, fall back to text analysis, but do
+                    # not let the degraded answer be cached for this email
                     print(f"URL analysis failed, falling back to text analysis: {e}")
+                    result = self._analyze_text_content(email_text)
+                    result['cacheable'] = False
+                    return result
             
             # Fall back to text content analysis
             return self._analyze_text_content(email_text)
@@ -97,36 +352,34 @@ class PhishingDetectorAnalyzer(ModelAnalyzer):
         except Exception as e:
             return self._error_result(f"Analysis failed: {str(e)}")
     
-    def _extract_urls(self, text: str) -> List[str]:
-        """Extract URLs from email text"""
-        import re
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        urls = re.findall(url_pattern, text)
-        return urls
+    def _extract_first_url(self, text: str) -> Optional[str]:
+        """Extract the first URL from email text"""
+        if '://' not in text:
+            return None
+        
+        match = URL_RE.search(text)
+        return match.group(0) if match else None
     
     def _analyze_text_content(self, email_text: str) -> Dict[str, Any]:
         """Analyze email text content when no URLs are present or ML model fails"""
         # Use rule-based analysis as fallback
         
         # Check for suspicious patterns
-        suspicious_words = ['urgent', 'account suspended', 'verify identity', 'click here', 'bank', 'password']
-        text_lower = email_text.lower()
-        
-        suspicious_count = sum(1 for word in suspicious_words if word in text_lower)
+        suspicious_count = _count_keywords(email_text.lower())['suspicious']
         
         # Create detailed description
         if suspicious_count >= 3:
-            decision = 'phishing'
+            decision = Decision.PHISHING
             confidence = min(0.8 + (suspicious_count - 3) * 0.1, 0.95)
-            description = f'High risk phishing indicators detected: {suspicious_count} suspicious patterns found in email content. Multiple red flags suggest this is likely a phishing attempt.'
+            description = TEXT_PHISHING_TEMPLATE.format(suspicious_count)
         elif suspicious_count >= 1:
-            decision = 'spam'
+            decision = Decision.SPAM
             confidence = 0.6 + suspicious_count * 0.1
-            description = f'Spam indicators detected: {suspicious_count} suspicious patterns found. This email shows characteristics of spam or low-quality content.'
+            description = TEXT_SPAM_TEMPLATE.format(suspicious_count)
         else:
-            decision = 'safe'
+            decision = Decision.SAFE
             confidence = 0.7
-            description = f'No suspicious patterns detected: Email content appears safe with {suspicious_count} suspicious indicators found.'
+            description = TEXT_SAFE_TEMPLATE.format(suspicious_count)
         
         return {
             'model_source': self.model_source,
@@ -135,16 +388,6 @@ class PhishingDetectorAnalyzer(ModelAnalyzer):
             'confidence': confidence,
             'description': description
         }
-    
-    def _error_result(self, error_msg: str) -> Dict[str, Any]:
-        """Return error result"""
-        return {
-            'model_source': self.model_source,
-            'model_name': self.model_name,
-            'decision': 'error',
-            'confidence': 0.0,
-            'description': error_msg
-        }
 
 class RuleBasedAnalyzer(ModelAnalyzer):
     """Rule-based analyzer as fallback"""
@@ -155,88 +398,70 @@ class RuleBasedAnalyzer(ModelAnalyzer):
     def analyze(self, email_text: str) -> Dict[str, Any]:
         """Analyze email using rule-based approach"""
         try:
-            # Extract metadata
-            metadata = self._extract_metadata(email_text.lower())
-            suspicious_patterns = self._detect_suspicious_patterns(email_text)
+            # Extract rule features
+            features = self._extract_features(email_text.lower())
             
             # Calculate risk score
-            risk_score = 0
-            risk_factors = []
-            
-            # Check for suspicious patterns
-            if 'urgency' in suspicious_patterns:
-                risk_score += 30
-                risk_factors.append('Urgency indicators detected')
-            
-            if 'financial_request' in suspicious_patterns:
-                risk_score += 40
-                risk_factors.append('Financial request detected')
-            
-            if 'personal_info_request' in suspicious_patterns:
-                risk_score += 50
-                risk_factors.append('Personal information request detected')
-            
-            if 'suspicious_domain' in suspicious_patterns:
-                risk_score += 60
-                risk_factors.append('Suspicious domain detected')
-            
-            # Check metadata
-            if metadata['urgency_indicators'] > 0:
-                risk_score += metadata['urgency_indicators'] * 10
-                risk_factors.append(f'{metadata["urgency_indicators"]} urgency indicators')
-            
-            if metadata['money_indicators'] > 0:
-                risk_score += metadata['money_indicators'] * 15
-                risk_factors.append(f'{metadata["money_indicators"]} financial indicators')
-            
-            # Determine decision based on risk score
-            if risk_score >= 70:
-                decision = 'phishing'
-                confidence = min(risk_score / 100.0, 0.95)
-            elif risk_score >= 40:
-                decision = 'spam'
-                confidence = min(risk_score / 70.0, 0.85)
-            else:
-                decision = 'safe'
-                confidence = max(1.0 - (risk_score / 40.0), 0.6)
-            
-            # Create detailed description
-            if risk_factors:
-                description = f'Risk score: {risk_score}/100. Detected factors: {", ".join(risk_factors)}. This analysis is based on pattern matching and content analysis.'
-            else:
-                description = f'Risk score: {risk_score}/100. No suspicious patterns detected. Email appears to be safe based on rule-based analysis.'
-            
-            return {
-                'model_source': self.model_source,
-                'model_name': self.model_name,
-                'decision': decision,
-                'confidence': confidence,
-                'description': description
-            }
+            risk_score, decision, confidence = _score_features(features)
+            return self._build_result(features, risk_score, decision, confidence)
             
         except Exception as e:
             return self._error_result(f"Analysis failed: {str(e)}")
     
+    def analyze_batch(self, email_texts: List[str]) -> List[Dict[str, Any]]:
+        """Analyze many emails, scoring all feature vectors in one pass"""
+        rows = []
+        errors = {}
+        
+        for index, email_text in enumerate(email_texts):
+            try:
+                rows.append(self._extract_features(email_text.lower()))
+            except Exception as e:
+                errors[index] = self._error_result(f"Analysis failed: {str(e)}")
+        
+        scored = iter(zip(rows, *_score_feature_rows(rows)))
+        results = []
+        
+        for index in range(len(email_texts)):
+            if index in errors:
+                results.append(errors[index])
+            else:
+                results.append(self._build_result(*next(scored)))
+        
+        return results
+    
+    def _build_result(self, features: Tuple[int, ...], risk_score: int, decision: Decision, confidence: float) -> Dict[str, Any]:
+        """Turn a scored feature vector into a result dict"""
+        return {
+            'model_source': self.model_source,
+            'model_name': self.model_name,
+            'decision': decision,
+            'confidence': confidence,
+            'description': _describe_rule_result(risk_score, features)
+        }
+    
+    def _extract_features(self, text: str) -> Tuple[int, ...]:
+        """Build the rule feature vector (see RULE_WEIGHTS) from lowercased text"""
+        metadata = self._extract_metadata(text)
+        suspicious_patterns = self._detect_suspicious_patterns(text)
+        
+        flags = tuple(int(category in suspicious_patterns) for category, _ in SUSPICIOUS_PATTERN_CATEGORIES)
+        return flags + (metadata['urgency_indicators'], metadata['money_indicators'])
+    
     def _extract_metadata(self, text: str) -> Dict[str, Any]:
-        """Extract metadata from email text"""
+        """Extract metadata from lowercased email text"""
         words = text.split()
         word_count = len(words)
         char_count = len(text)
         
-        # Count urgency indicators
-        urgency_words = ['urgent', 'immediate', 'asap', 'quickly', 'hurry', 'limited time', 'expires', 'deadline']
-        urgency_indicators = sum(1 for word in urgency_words if word in text)
-        
-        # Count money indicators
-        money_words = ['money', 'bank', 'account', 'credit card', 'payment', 'transfer', 'refund', 'lottery', 'inheritance']
-        money_indicators = sum(1 for word in money_words if word in text)
-        
-        # Check for URLs and email addresses
-        url_pattern = r'http[s]?://(?:[a-zA-Z]|[0-9]|[$-_@.&+]|[!*\\(\\),]|(?:%[0-9a-fA-F][0-9a-fA-F]))+'
-        email_pattern = r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b'
+        # Count urgency and money indicators, reusing the tokens
+        keyword_counts = _count_keywords(text, words)
+        urgency_indicators = keyword_counts['urgency']
+        money_indicators = keyword_counts['money']
         
-        has_urls = bool(re.search(url_pattern, text))
-        has_email_addresses = bool(re.search(email_pattern, text))
+        # Check for URLs and email addresses (cheap substring test first)
+        has_urls = '://' in text and bool(URL_RE.search(text))
+        has_email_addresses = '@' in text and bool(EMAIL_RE.search(text))
         
         return {
             'word_count': word_count,
@@ -248,81 +473,70 @@ class RuleBasedAnalyzer(ModelAnalyzer):
         }
     
     def _detect_suspicious_patterns(self, text: str) -> List[str]:
-        """Detect suspicious patterns in email text"""
+        """Detect suspicious patterns in lowercased email text"""
         patterns = []
         
-        # Urgency patterns
-        urgency_patterns = [
-            r'urgent.*action',
-            r'limited.*time',
-            r'expires.*soon',
-            r'act.*now',
-            r'immediate.*attention'
-        ]
-        
-        for pattern in urgency_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                patterns.append('urgency')
-                break
+        if _HS_DB is not None:
+            mask = _hs_scan(text)
+            for bit, (category, _) in enumerate(SUSPICIOUS_PATTERN_CATEGORIES):
+                if mask & (1 << bit):
+                    patterns.append(category)
+            return patterns
         
-        # Financial request patterns
-        financial_patterns = [
-            r'bank.*account',
-            r'credit.*card',
-            r'payment.*required',
-            r'money.*transfer',
-            r'account.*verification'
-        ]
-        
-        for pattern in financial_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                patterns.append('financial_request')
-                break
-        
-        # Personal info request patterns
-        personal_patterns = [
-            r'social.*security',
-            r'password.*reset',
-            r'personal.*information',
-            r'verify.*identity',
-            r'account.*details'
-        ]
-        
-        for pattern in personal_patterns:
-            if re.search(pattern, text, re.IGNORECASE):
-                patterns.append('personal_info_request')
-                break
-        
-        # Suspicious domain patterns
-        suspicious_domains = [
-            r'paypal.*verify',
-            r'bank.*secure',
-            r'account.*update',
-            r'security.*alert'
-        ]
-        
-        for pattern in suspicious_domains:
-            if re.search(pattern, text, re.IGNORECASE):
-                patterns.append('suspicious_domain')
-                break
+        for category, regex in SUSPICIOUS_PATTERN_CATEGORIES:
+            if regex.search(text):
+                patterns.append(category)
         
         return patterns
+
+@dataclass(slots=True)
+class AnalyzerResultCols:
+    """Analyzer results for one email stored column-wise; dicts are built on output"""
+    model_sources: List[str] = field(default_factory=list)
+    model_names: List[str] = field(default_factory=list)
+    decisions: List[Union[Decision, str]] = field(default_factory=list)
+    confidences: List[float] = field(default_factory=list)
+    descriptions: List[str] = field(default_factory=list)
+    # False once any analyzer errored or returned a degraded ('cacheable': False) result
+    cacheable: bool = True
     
-    def _error_result(self, error_msg: str) -> Dict[str, Any]:
-        """Return error result"""
-        return {
-            'model_source': self.model_source,
-            'model_name': self.model_name,
-            'decision': 'error',
-            'confidence': 0.0,
-            'description': error_msg
-        }
+    def append(self, result: Dict[str, Any]):
+        """Add one analyzer result"""
+        self.model_sources.append(result.get('model_source', 'unknown'))
+        self.model_names.append(result.get('model_name', 'unknown'))
+        self.decisions.append(result.get('decision', Decision.UNKNOWN))
+        self.confidences.append(result.get('confidence', 0.0))
+        self.descriptions.append(result.get('description', 'No description available'))
+        
+        if result.get('cacheable', True) is False or self.decisions[-1] in (Decision.ERROR, 'error'):
+            self.cacheable = False
+    
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Materialize the results as a list of result dicts"""
+        return [
+            {
+                'model_source': model_source,
+                'model_name': model_name,
+                'decision': decision,
+                'confidence': confidence,
+                'description': description
+            }
+            for model_source, model_name, decision, confidence, description in zip(
+                self.model_sources, self.model_names, self.decisions, self.confidences, self.descriptions
+            )
+        ]
+
+# Shared pool for running an email's other analyzers alongside the calling thread
+_analyzer_executor = ThreadPoolExecutor(thread_name_prefix='email-guard')
 
 class EmailAnalyzer:
     """Main email analyzer that coordinates multiple models"""
     
     def __init__(self):
+        # Treat as read-only: add analyzers through add_analyzer() so the
+        # cached model info and analysis results are reset
         self.analyzers = []
+        self._info = None
         self.load_analyzers()
     
     def load_analyzers(self):
@@ -343,37 +557,130 @@ class EmailAnalyzer:
     def add_analyzer(self, analyzer: ModelAnalyzer):
         """Add an analyzer to the list"""
         self.analyzers.append(analyzer)
+        self._info = None
+        
+        # Cached results do not include the new analyzer
+        clear_analysis_cache()
+    
+    @property
+    def model_info(self) -> Dict[str, Any]:
+        """Information about the loaded models, built once per analyzer set"""
+        info = self._info
+        if info is None:
+            models = [
+                {
+                    'name': analyzer_instance.model_name,
+                    'source': analyzer_instance.model_source,
+                    'status': 'loaded' if getattr(analyzer_instance, 'detector', None) else 'available'
+                }
+                for analyzer_instance in self.analyzers
+            ]
+            info = self._info = {
+                'total_models': len(models),
+                'models': models,
+                'primary_ml_available': PHISHING_DETECTOR_AVAILABLE,
+                'primary_model': 'phishing-detection-py' if PHISHING_DETECTOR_AVAILABLE else 'rule-based'
+            }
+        
+        # Copies, so callers cannot modify the cached info
+        return {**info, 'models': [dict(model) for model in info['models']]}
     
     def analyze_email(self, email_text: str) -> List[Dict[str, Any]]:
         """Analyze email using all available models"""
-        results = []
+        return self.analyze_email_columns(email_text).to_dicts()
+    
+    def analyze_email_columns(self, email_text: str) -> AnalyzerResultCols:
+        """Analyze email using all available models, keeping results column-wise"""
+        analyzers = list(self.analyzers)
+        
+        # All but the last analyzer go to the pool; the calling thread runs
+        # the last one itself instead of just waiting on the others
+        futures = [_analyzer_executor.submit(analyzer.analyze, email_text) for analyzer in analyzers[:-1]]
+        inline_result = inline_error = None
+        if analyzers:
+            try:
+                inline_result = analyzers[-1].analyze(email_text)
+            except Exception as e:
+                inline_error = e
+        
+        results = AnalyzerResultCols()
         
-        for analyzer in self.analyzers:
+        for index, analyzer in enumerate(analyzers):
             try:
-                result = analyzer.analyze(email_text)
+                if index < len(futures):
+                    result = futures[index].result()
+                elif inline_error is not None:
+                    raise inline_error
+                else:
+                    result = inline_result
                 results.append(result)
             except Exception as e:
                 # Add error result for this analyzer
                 results.append({
                     'model_source': analyzer.model_source,
                     'model_name': analyzer.model_name,
-                    'decision': 'error',
+                    'decision': Decision.ERROR,
                     'confidence': 0.0,
                     'description': f'Analysis failed: {str(e)}'
                 })
         
         return results
 
+    def analyze_emails_batch(self, email_texts: List[str]) -> List[List[Dict[str, Any]]]:
+        """Analyze several emails using all available models, one result list per email"""
+        results = [AnalyzerResultCols() for _ in email_texts]
+        
+        for analyzer in list(self.analyzers):
+            try:
+                analyzer_results = analyzer.analyze_batch(email_texts)
+            except Exception as e:
+                # Add error result for this analyzer to every email
+                analyzer_results = [{
+                    'model_source': analyzer.model_source,
+                    'model_name': analyzer.model_name,
+                    'decision': Decision.ERROR,
+                    'confidence': 0.0,
+                    'description': f'Analysis failed: {str(e)}'
+                } for _ in email_texts]
+            
+            for email_results, result in zip(results, analyzer_results):
+                email_results.append(result)
+        
+        return [email_results.to_dicts() for email_results in results]
+
 # Global analyzer instance
 _analyzer = None
+_analyzer_lock = threading.Lock()
 
 def get_analyzer() -> EmailAnalyzer:
     """Get or create the global analyzer instance"""
     global _analyzer
     if _analyzer is None:
-        _analyzer = EmailAnalyzer()
+        with _analyzer_lock:
+            # Re-check so concurrent first callers load the models only once
+            if _analyzer is None:
+                _analyzer = EmailAnalyzer()
     return _analyzer
 
+# Results of recent analyses, keyed by a digest of the email text
+_RESULT_CACHE_SIZE = 4096
+_result_cache: "OrderedDict[bytes, AnalyzerResultCols]" = OrderedDict()
+_result_cache_lock = threading.Lock()
+# Bumped on every clear; analyses started under an older generation
+# (e.g. before an analyzer was added) must not be inserted
+_result_cache_generation = 0
+
+def _email_digest(email_text: str) -> bytes:
+    """Hash email text into a compact cache key"""
+    return hashlib.blake2b(email_text.encode('utf-8', 'surrogatepass'), digest_size=16).digest()
+
+def clear_analysis_cache():
+    """Drop all cached analysis results"""
+    global _result_cache_generation
+    with _result_cache_lock:
+        _result_cache_generation += 1
+        _result_cache.clear()
+
 def analyze_email_with_models(email_text: str) -> List[Dict[str, Any]]:
     """
     Main function to analyze email with all available models
@@ -384,29 +691,49 @@ def analyze_email_with_models(email_text: str) -> List[Dict[str, Any]]:
     Returns:
         List of model results with required fields
     """
+    key = _email_digest(email_text)
+    with _result_cache_lock:
+        generation = _result_cache_generation
+        cached = _result_cache.get(key)
+        if cached is not None:
+            _result_cache.move_to_end(key)
+    
+    if cached is None:
+        analyzer = get_analyzer()
+        cached = analyzer.analyze_email_columns(email_text)
+        
+        # Errors and fallbacks may be transient, so only full analyses are cached
+        if cached.cacheable:
+            with _result_cache_lock:
+                if generation == _result_cache_generation:
+                    _result_cache[key] = cached
+                    if len(_result_cache) > _RESULT_CACHE_SIZE:
+                        _result_cache.popitem(last=False)
+    
+    # Fresh dicts on every call, so callers cannot modify cached entries
+    return cached.to_dicts()
+
+def analyze_emails_batch(email_texts: List[str]) -> List[List[Dict[str, Any]]]:
+    """
+    Analyze several emails with all available models in one call
+    
+    Args:
+        email_texts: Email texts to analyze
+        
+    Returns:
+        One list of model results per email, in input order
+    """
     analyzer = get_analyzer()
-    return analyzer.analyze_email(email_text)
+    return analyzer.analyze_emails_batch(list(email_texts))
 
 def get_model_info() -> Dict[str, Any]:
     """Get information about available models"""
-    analyzer = get_analyzer()
-    models = []
-    
-    for analyzer_instance in analyzer.analyzers:
-        models.append({
-            'name': analyzer_instance.model_name,
-            'source': analyzer_instance.model_source,
-            'status': 'loaded' if hasattr(analyzer_instance, 'detector') and analyzer_instance.detector else 'available'
-        })
-    
-    return {
-        'total_models': len(models),
-        'models': models,
-        'primary_ml_available': PHISHING_DETECTOR_AVAILABLE,
-        'primary_model': 'phishing-detection-py' if PHISHING_DETECTOR_AVAILABLE else 'rule-based'
-    }
+    return get_analyzer().model_info
 
 def add_custom_analyzer(analyzer: ModelAnalyzer):
     """Add a custom analyzer to the global analyzer"""
     global_analyzer = get_analyzer()
-    global_analyzer.add_analyzer(analyzer)
\ No newline at end of file
+    global_analyzer.add_analyzer(analyzer)
+
+# Load models at import so the first request does not pay for it
+get_analyzer()
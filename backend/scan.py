@@ -38,7 +38,7 @@ def scan_email(email_text: str) -> List[Dict[str, Any]]:
             validated_result = {
                 'model_source': result.get('model_source', 'unknown'),
                 'model_name': result.get('model_name', 'unknown'),
-                'decision': result.get('decision', 'unknown'),
+                'decision': str(result.get('decision', 'unknown')),
                 'confidence': float(result.get('confidence', 0.0)),
                 'description': result.get('description', 'No description available')
             }
@@ -4,16 +4,23 @@ Startup script for Email Guard Backend on Render
 """
 import uvicorn
 import os
-from backend.app import app
 
 if __name__ == "__main__":
     # Get port from environment variable (Render sets PORT)
     port = int(os.environ.get("PORT", 5000))
 
+    # One worker process per core unless WEB_CONCURRENCY says otherwise
+    # (an empty value counts as unset)
+    workers = int(os.environ.get("WEB_CONCURRENCY") or os.cpu_count() or 1)
+
     # Run the FastAPI app
     uvicorn.run(
         "backend.app:app",
         host="0.0.0.0",
         port=port,
-        reload=False  # Disable reload in production
+        reload=False,  # Disable reload in production
+        loop="auto",  # uvloop/httptools from uvicorn[standard] when available
+        http="auto",
+        access_log=False,  # Per-request logging is costly on the scan endpoint
+        workers=max(1, workers)
     )